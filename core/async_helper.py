@@ -1,3 +1,4 @@
+import os
 import threading
 import asyncio
 import queue
@@ -15,15 +16,22 @@ class AsyncHelper:
     - Non-blocking operation queues
     - Priority-based task scheduling
     - Automatic resource cleanup
+    
+    A single instance is meant to be shared by all components so the
+    process has one worker pool. By default it is sized to leave one core
+    free for the camera/display threads.
     """
     
-    def __init__(self, max_workers: int = 2):
+    def __init__(self, max_workers: Optional[int] = None):
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) - 1)
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.loop = asyncio.new_event_loop()
         self.thread = None
         self.running = False
         self.task_queue = queue.PriorityQueue()
         self.results = {}
+        self.done_events = {}  # task_id -> Event set when the task finishes
         self.lock = threading.Lock()
         
     def start(self):
@@ -69,6 +77,11 @@ class AsyncHelper:
                 
         except Exception as e:
             print(f"Error processing task {task_id}: {e}")
+        finally:
+            # Wake any waiter; later waiters fall back to the results dict
+            event = self.done_events.pop(task_id, None)
+            if event is not None:
+                event.set()
             
     def schedule_task(self, func: Callable, priority: int = 1, 
                      task_id: Optional[str] = None, *args, **kwargs) -> str:
@@ -94,6 +107,7 @@ class AsyncHelper:
             task_kwargs.pop('args', None)
             task_kwargs.pop('kwargs', None)
             
+            self.done_events[task_id] = threading.Event()
             self.task_queue.put_nowait((priority, task_id, func, task_args, task_kwargs))
         except queue.Full:
             print(f"Warning: Task queue full, dropping task {task_id}")
@@ -106,6 +120,17 @@ class AsyncHelper:
             return self.results.pop(task_id, None)
         return self.results.get(task_id)
         
+    def wait_result(self, task_id: str, timeout: Optional[float] = None) -> Any:
+        """Block until a task finishes and return (and clear) its result
+        
+        Returns None if the task produced no result, failed, or did not
+        finish within timeout.
+        """
+        event = self.done_events.get(task_id)
+        if event is not None and not event.wait(timeout):
+            return None
+        return self.results.pop(task_id, None)
+        
     def clear_results(self):
         """Clear results without locking"""
         self.results.clear()
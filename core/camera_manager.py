@@ -7,7 +7,9 @@ from core.frame_buffer import FrameBuffer
 from core.async_helper import AsyncHelper
 import os
 import time
+import threading
 from collections import deque
+from typing import Optional
 
 class ZoomLevel(Enum):
     WIDE = 1
@@ -19,13 +21,18 @@ class CameraManager:
     """
     Manages PiCamera2 operations using threading for optimal performance
     """
-    def __init__(self):
+    def __init__(self, async_helper: Optional[AsyncHelper] = None):
         self.picam2 = Picamera2()
         self.frame_buffer = FrameBuffer(buffer_size=3)
-        self.async_helper = AsyncHelper(max_workers=2)
+        # Use the shared helper when given; only a private one is started/stopped here
+        self._owns_async_helper = async_helper is None
+        self.async_helper = async_helper if async_helper is not None else AsyncHelper(max_workers=2)
         self.focus_range = (8.0, 12.5)
         self.current_zoom = ZoomLevel.FACE
         self.running = False
+        # Set whenever a new frame lands in the buffer; consumers wait on it
+        # and clear it themselves instead of polling get_latest_frame()
+        self.frame_ready = threading.Event()
         
         # Performance monitoring
         self.frame_times = deque(maxlen=60)  # Store last 60 frame timestamps
@@ -114,7 +121,8 @@ class CameraManager:
         """Start the camera and frame capture"""
         if not self.running:
             self.running = True
-            self.async_helper.start()
+            if self._owns_async_helper:
+                self.async_helper.start()
             
             try:
                 self.picam2.start_preview(Preview.QT, x=10, y=0, width=1100, height=1100)
@@ -139,7 +147,8 @@ class CameraManager:
         """Stop the camera and frame capture"""
         if self.running:
             self.running = False
-            self.async_helper.stop()
+            if self._owns_async_helper:
+                self.async_helper.stop()
             self.picam2.stop()
             
     def _process_frame(self, frame):
@@ -179,6 +188,7 @@ class CameraManager:
             processed_frame = self._process_frame(frame)
             if processed_frame is not None:
                 self.frame_buffer.add_frame(processed_frame)
+                self.frame_ready.set()
                 
                 # Calculate and store latency
                 latency = time.monotonic() - frame_time
@@ -194,6 +204,14 @@ class CameraManager:
         except Exception as e:
             print(f"ERROR in camera callback: {e}")
             
+    def _tick(self):
+        """Capture one request and run it through the frame callback synchronously"""
+        request = self.picam2.capture_request()
+        try:
+            self._camera_callback(request)
+        finally:
+            request.release()
+            
     def _print_performance_stats(self):
         """Calculate and print performance statistics"""
         if len(self.frame_times) < 2:
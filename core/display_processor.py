@@ -204,21 +204,25 @@ class DisplayProcessor:
     def _display_loop(self):
         """Main display loop running at camera FPS"""
         while self.running:
-            current_time = time.monotonic()
-            
-            # Only update at target frame rate
-            if current_time - self.last_display_update >= self.min_display_interval:
-                frame = self.camera_manager.get_latest_frame_direct()  # Use direct frame access
-                if frame is not None:
-                    # Apply tighter software crop for display
-                    display_frame = self._software_crop_for_display(frame)
-                    # Display the frame directly
-                    self.display_frame(display_frame)
-
-                self.last_display_update = current_time
+            self._tick()
             
             # Small sleep to prevent CPU thrashing
             time.sleep(0.001)
+            
+    def _tick(self):
+        """Run one iteration of the display loop"""
+        current_time = time.monotonic()
+        
+        # Only update at target frame rate
+        if current_time - self.last_display_update >= self.min_display_interval:
+            frame = self.camera_manager.get_latest_frame_direct()  # Use direct frame access
+            if frame is not None:
+                # Apply tighter software crop for display
+                display_frame = self._software_crop_for_display(frame)
+                # Display the frame directly
+                self.display_frame(display_frame)
+
+            self.last_display_update = current_time
 
     def _update_crop_with_face(self, face_data):
         """Update crop based on face detection data"""
@@ -1,36 +1,42 @@
 import time
 import threading
-import os
-from typing import Optional, Deque
+from typing import Optional, Deque, Callable, List
 from collections import deque
-from gpiozero import DistanceSensor as GPIOZeroDistance
+import numpy as np
+import lgpio
 from core.async_helper import AsyncHelper
 
-# Tell gpiozero to use lgpio by default
-os.environ['GPIOZERO_PIN_FACTORY'] = 'lgpio'
+# Speed of sound in cm per nanosecond, halved for the round trip
+ECHO_NS_TO_CM = 34300 / 1e9 / 2
 
 class DistanceSensor:
     """
     Asynchronous distance sensor management with focus mapping
     
     Features:
-    - Non-blocking operation using gpiozero
+    - Echo pulse timed from kernel edge timestamps (lgpio alerts)
     - Direct mapping to focus values
     - 5Hz sampling rate (200ms interval)
     - Performance monitoring
     - Resource cleanup
     """
     
-    def __init__(self, trigger_pin: int, echo_pin: int, async_helper: Optional[AsyncHelper] = None):
-        # GPIO setup
+    def __init__(self, trigger_pin: int, echo_pin: int, async_helper: Optional[AsyncHelper] = None,
+                 gpio_chip: int = 0):
+        # GPIO setup. The 40-pin header is gpiochip0 on most boards, but a
+        # Pi 5 on older kernels exposes it as gpiochip4
         self.trigger_pin = trigger_pin
         self.echo_pin = echo_pin
+        self.gpio_chip = gpio_chip
         self.async_helper = async_helper
         
         # Threading controls
         self.running = False
         self.thread = None
         
+        # Called with (distance, focus) from the sensor thread after each sample
+        self.listeners: List[Callable[[float, float], None]] = []
+        
         # Distance and focus parameters
         self.current_distance = 0.0
         self.min_distance = 30.0  # cm - adjusted to match calibration range
@@ -55,21 +61,41 @@ class DistanceSensor:
             87.1: 9.50,  # Farthest focus
         }
         
+        # Echo edge capture state, written from the lgpio callback thread
+        self.echo_timeout = 0.03  # s - well beyond the ~12ms echo at 2m
+        self._echo_rise_ns = None
+        self._echo_width_ns = 0
+        self._echo_done = threading.Event()
+        
         # Initialize sensor
-        print(f"Initializing HC-SR04 distance sensor on pins: Trigger={trigger_pin}, Echo={echo_pin}")
+        print(f"Initializing HC-SR04 distance sensor on gpiochip{gpio_chip} pins: Trigger={trigger_pin}, Echo={echo_pin}")
+        self.chip = None
         try:
-            # Note: gpiozero expects echo_pin first, then trigger_pin
-            self.sensor = GPIOZeroDistance(
-                echo=echo_pin,
-                trigger=trigger_pin,
-                max_distance=2.0,  # Maximum distance in meters
-                threshold_distance=0.3  # Threshold for when_in_range
-            )
+            self.chip = lgpio.gpiochip_open(gpio_chip)
+            lgpio.gpio_claim_output(self.chip, trigger_pin, 0)
+            lgpio.gpio_claim_alert(self.chip, echo_pin, lgpio.BOTH_EDGES)
+            self._echo_callback = lgpio.callback(self.chip, echo_pin, lgpio.BOTH_EDGES, self._on_echo_edge)
             print("Distance sensor initialized successfully")
         except Exception as e:
             print(f"Failed to initialize distance sensor: {e}")
+            if self.chip is not None:
+                # Release whatever was claimed before the failure
+                for pin in (echo_pin, trigger_pin):
+                    try:
+                        lgpio.gpio_free(self.chip, pin)
+                    except Exception:
+                        pass  # Never claimed
+                lgpio.gpiochip_close(self.chip)
             raise
             
+    def _on_echo_edge(self, chip, gpio, level, timestamp):
+        """Record echo pulse edges using the kernel's nanosecond timestamps"""
+        if level == 1:
+            self._echo_rise_ns = timestamp
+        elif level == 0 and self._echo_rise_ns is not None:
+            self._echo_width_ns = timestamp - self._echo_rise_ns
+            self._echo_done.set()
+            
     def _measure_distance(self) -> float:
         """
         Measure distance using ultrasonic sensor
@@ -78,8 +104,16 @@ class DistanceSensor:
         try:
             start_time = time.monotonic()
             
-            # Get distance in meters and convert to cm
-            distance_cm = self.sensor.distance * 100
+            # Fire a trigger pulse (>= 10us) and wait for the echo's falling edge
+            self._echo_rise_ns = None
+            self._echo_done.clear()
+            lgpio.gpio_write(self.chip, self.trigger_pin, 1)
+            time.sleep(0.00001)
+            lgpio.gpio_write(self.chip, self.trigger_pin, 0)
+            if not self._echo_done.wait(self.echo_timeout):
+                return self.current_distance  # No echo, keep last reading
+            
+            distance_cm = self._echo_width_ns * ECHO_NS_TO_CM
             
             # Clamp to valid range
             distance_cm = max(self.min_distance, min(self.max_distance, distance_cm))
@@ -94,6 +128,28 @@ class DistanceSensor:
             print(f"Error in distance measurement: {e}")
             return self.current_distance
             
+    @property
+    def distance_focus_map(self) -> dict:
+        """Distance (cm) to lens position calibration points"""
+        return self._distance_focus_map
+        
+    @distance_focus_map.setter
+    def distance_focus_map(self, focus_map: dict):
+        # Assigning a new map rebuilds the lookup arrays, so it takes effect
+        # on the next sample. Assign a new dict rather than editing in place.
+        self._distance_focus_map = focus_map
+        self._build_focus_lut()
+        
+    def _build_focus_lut(self):
+        """Cache the focus map as sorted arrays"""
+        distances = sorted(self._distance_focus_map)
+        self._lut_distances = np.array(distances)
+        self._lut_focus = np.array([self._distance_focus_map[d] for d in distances])
+        
+    def _raw_focus(self, distance: float) -> float:
+        """Linearly interpolate focus from the map, clamped at both ends"""
+        return float(np.interp(distance, self._lut_distances, self._lut_focus))
+        
     def _map_distance_to_focus(self, distance: float) -> float:
         """
         Map distance to focus value using linear interpolation
@@ -102,26 +158,7 @@ class DistanceSensor:
         Returns:
             focus: Focus value
         """
-        # Sort distance-focus pairs
-        distances = sorted(self.distance_focus_map.keys())
-        
-        # Handle out of range values
-        if distance <= distances[0]:
-            raw_focus = self.distance_focus_map[distances[0]]
-        elif distance >= distances[-1]:
-            raw_focus = self.distance_focus_map[distances[-1]]
-        else:
-            # Find surrounding points for interpolation
-            for i in range(len(distances) - 1):
-                d1, d2 = distances[i], distances[i + 1]
-                if d1 <= distance <= d2:
-                    f1 = self.distance_focus_map[d1]
-                    f2 = self.distance_focus_map[d2]
-                    # Linear interpolation
-                    raw_focus = f1 + (f2 - f1) * (distance - d1) / (d2 - d1)
-                    break
-            else:
-                raw_focus = self.distance_focus_map[distances[0]]  # Fallback
+        raw_focus = self._raw_focus(distance)
         
         # Apply smoothing if enabled
         if self.focus_smoothing_enabled:
@@ -160,6 +197,12 @@ class DistanceSensor:
                     # Calculate focus value
                     focus = self._map_distance_to_focus(distance)
                     
+                    for listener in self.listeners:
+                        try:
+                            listener(distance, focus)
+                        except Exception as e:
+                            print(f"Error in distance listener: {e}")
+                    
                     # Schedule focus update if using AsyncHelper
                     if self.async_helper is not None:
                         self.async_helper.schedule_task(
@@ -189,20 +232,7 @@ class DistanceSensor:
             current_focus = self.get_current_focus()
             
             # Calculate raw focus for comparison
-            raw_focus = None
-            distances = sorted(self.distance_focus_map.keys())
-            if current_distance <= distances[0]:
-                raw_focus = self.distance_focus_map[distances[0]]
-            elif current_distance >= distances[-1]:
-                raw_focus = self.distance_focus_map[distances[-1]]
-            else:
-                for i in range(len(distances) - 1):
-                    d1, d2 = distances[i], distances[i + 1]
-                    if d1 <= current_distance <= d2:
-                        f1 = self.distance_focus_map[d1]
-                        f2 = self.distance_focus_map[d2]
-                        raw_focus = f1 + (f2 - f1) * (current_distance - d1) / (d2 - d1)
-                        break
+            raw_focus = self._raw_focus(current_distance)
             
             print(f"\n=== Distance Sensor Status ===")
             print(f"Distance: {current_distance:.1f}cm")
@@ -214,6 +244,10 @@ class DistanceSensor:
         """Update focus value (placeholder for callback)"""
         pass  # This will be set by the main program
         
+    def add_listener(self, listener: Callable[[float, float], None]):
+        """Register a callback to receive (distance, focus) for every new sample"""
+        self.listeners.append(listener)
+        
     def start(self):
         """Start the distance sensor"""
         if not self.running:
@@ -231,7 +265,10 @@ class DistanceSensor:
             
         # Cleanup sensor
         try:
-            self.sensor.close()
+            self._echo_callback.cancel()
+            lgpio.gpio_free(self.chip, self.echo_pin)
+            lgpio.gpio_free(self.chip, self.trigger_pin)
+            lgpio.gpiochip_close(self.chip)
         except Exception as e:
             print(f"Sensor cleanup warning: {e}")
             
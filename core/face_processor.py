@@ -16,13 +16,15 @@ class FaceData:
     bbox: List[float]  # [xmin, ymin, width, height]
     landmarks: List[Tuple[float, float]]  # [(x1,y1), (x2,y2), ...]
     confidence: float
+    seq: int = 0  # Detection sequence number, lets consumers skip unchanged data
     
     def copy(self):
         """Create a deep copy of the face data"""
         return FaceData(
             bbox=self.bbox.copy(),
             landmarks=self.landmarks.copy(),
-            confidence=self.confidence
+            confidence=self.confidence,
+            seq=self.seq
         )
 
 class FaceProcessor:
@@ -51,6 +53,7 @@ class FaceProcessor:
         
         # Face tracking state
         self.current_face_data: Optional[FaceData] = None
+        self.face_seq = 0  # Incremented for every detection
         self.smoothing_factor = 0.4  # Lower = smoother but more latency
         self.last_process_time = 0
         self.min_process_interval = 0.2  # 5 FPS target for face detection
@@ -126,7 +129,9 @@ class FaceProcessor:
         
     def _smooth_face_data(self, new_data: FaceData):
         """Apply smoothing to face tracking data with minimal locking"""
+        self.face_seq += 1
         if self.current_face_data is None:
+            new_data.seq = self.face_seq
             # First face detection, just set it directly
             with self.lock:
                 self.current_face_data = new_data
@@ -158,7 +163,8 @@ class FaceProcessor:
         smoothed_data = FaceData(
             bbox=smoothed_bbox,
             landmarks=smoothed_landmarks,
-            confidence=new_data.confidence
+            confidence=new_data.confidence,
+            seq=self.face_seq
         )
         
         # Minimal lock time: just for the assignment
@@ -168,27 +174,30 @@ class FaceProcessor:
     def _processing_loop(self):
         """Main processing loop running in separate thread"""
         print("Starting face processing loop...")
-        last_process_time = time.monotonic()
+        self.last_process_time = time.monotonic()
         
         while self.running:
-            current_time = time.monotonic()
-            
-            # Get frame from camera
-            frame = self.camera_manager.get_latest_frame()
-            if frame is None:
-                time.sleep(0.001)
-                continue
-                
-            # Only process frame if enough time has passed (5 FPS)
-            if current_time - last_process_time >= self.min_process_interval:
-                # Process frame
-                face_data = self.process_frame(frame)
-                if face_data:
-                    self._smooth_face_data(face_data)
-                last_process_time = current_time
+            self._tick()
             
             # Small sleep to prevent CPU thrashing
             time.sleep(0.001)
+            
+    def _tick(self):
+        """Run one iteration of the processing loop"""
+        current_time = time.monotonic()
+        
+        # Get frame from camera
+        frame = self.camera_manager.get_latest_frame()
+        if frame is None:
+            return
+            
+        # Only process frame if enough time has passed (5 FPS)
+        if current_time - self.last_process_time >= self.min_process_interval:
+            # Process frame
+            face_data = self.process_frame(frame)
+            if face_data:
+                self._smooth_face_data(face_data)
+            self.last_process_time = current_time
 
     def update_scaler_crop(self, face_data):
         """Update ScalerCrop settings based on face data."""
@@ -209,26 +218,29 @@ class CameraFaceProcessor(FaceProcessor):
         
     def _processing_loop(self):
         """Main processing loop running in separate thread"""
-        last_process_time = time.monotonic()
+        self.last_process_time = time.monotonic()
         
         while self.running:
-            current_time = time.monotonic()
-            
-            # Get frame from camera
-            frame = self.camera_manager.get_latest_frame()
-            if frame is None:
-                time.sleep(0.001)
-                continue
-                
-            # Only process frame if enough time has passed (5 FPS)
-            if current_time - last_process_time >= self.min_process_interval:
-                # Process frame
-                face_data = self.process_frame(frame)
-                if face_data:
-                    self._smooth_face_data(face_data)
-                    # Update ScalerCropController with new face data
-                    self.scaler_crop_controller.update_target_crop(face_data)
-                last_process_time = current_time
+            self._tick()
             
             # Small sleep to prevent CPU thrashing
-            time.sleep(0.001) 
\ No newline at end of file
+            time.sleep(0.001)
+            
+    def _tick(self):
+        """Run one iteration of the processing loop"""
+        current_time = time.monotonic()
+        
+        # Get frame from camera
+        frame = self.camera_manager.get_latest_frame()
+        if frame is None:
+            return
+            
+        # Only process frame if enough time has passed (5 FPS)
+        if current_time - self.last_process_time >= self.min_process_interval:
+            # Process frame
+            face_data = self.process_frame(frame)
+            if face_data:
+                self._smooth_face_data(face_data)
+                # Update ScalerCropController with new face data
+                self.scaler_crop_controller.update_target_crop(face_data)
+            self.last_process_time = current_time 
\ No newline at end of file
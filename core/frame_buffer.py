@@ -1,7 +1,6 @@
 from collections import deque
-import threading
 import numpy as np
-from typing import Optional
+from typing import Iterable, Optional
 import queue
 
 class FrameBuffer:
@@ -22,15 +21,16 @@ class FrameBuffer:
             buffer_size: Maximum number of frames to store
         """
         self._frames = queue.Queue(maxsize=buffer_size)
-        self._latest_frame = None  # Atomic latest frame reference
-        self._latest_frame_lock = threading.Lock()  # Separate lock for latest frame
+        # Latest frame reference. Single producer / single reader of the
+        # newest frame only: a reference store/load is atomic under the GIL,
+        # so no lock is needed.
+        self._latest_frame = None
         
     def add_frame(self, frame: np.ndarray):
         """Add a new frame, dropping oldest if buffer is full"""
         if frame is not None:
-            # Update latest frame atomically
-            with self._latest_frame_lock:
-                self._latest_frame = frame
+            # Publish latest frame (atomic reference store)
+            self._latest_frame = frame
             
             # Try to add to queue without blocking
             try:
@@ -43,10 +43,14 @@ class FrameBuffer:
                 except (queue.Empty, queue.Full):
                     pass  # Race condition handled gracefully
                 
+    def add_frames(self, frames: Iterable[np.ndarray]):
+        """Add frames in order, dropping the oldest as the buffer fills"""
+        for frame in frames:
+            self.add_frame(frame)
+                
     def get_latest_frame(self) -> Optional[np.ndarray]:
-        """Get latest frame with minimal locking"""
-        with self._latest_frame_lock:
-            return self._latest_frame
+        """Get latest frame without locking"""
+        return self._latest_frame
             
     def clear(self):
         """Clear buffer efficiently"""
@@ -55,8 +59,7 @@ class FrameBuffer:
                 self._frames.get_nowait()
             except queue.Empty:
                 break
-        with self._latest_frame_lock:
-            self._latest_frame = None
+        self._latest_frame = None
             
     @property
     def is_empty(self) -> bool:
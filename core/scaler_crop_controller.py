@@ -120,27 +120,30 @@ class ScalerCropController:
     def _update_loop(self):
         """Main loop for updating ScalerCrop settings"""
         while self.running:
-            current_time = time.monotonic()
-            
-            # Update at 5 FPS
-            if current_time - self.last_update_time >= self.min_update_interval:
-                with self.lock:
-                    if self.target_crop is not None:
-                        crop_settings = self._smooth_crop_update()
-                        if crop_settings:
-                            try:
-                                # Convert normalized coordinates to sensor coordinates
-                                sensor_crop = self._convert_to_sensor_coordinates(crop_settings)
-                                self.camera_manager.picam2.set_controls({
-                                    "ScalerCrop": sensor_crop
-                                })
-                            except Exception as e:
-                                print(f"Error updating ScalerCrop: {e}")
-                                
-                self.last_update_time = current_time
-                
+            self._tick()
             time.sleep(0.001)  # Prevent CPU thrashing
             
+    def _tick(self):
+        """Run one iteration of the update loop"""
+        current_time = time.monotonic()
+        
+        # Update at 5 FPS
+        if current_time - self.last_update_time >= self.min_update_interval:
+            with self.lock:
+                if self.target_crop is not None:
+                    crop_settings = self._smooth_crop_update()
+                    if crop_settings:
+                        try:
+                            # Convert normalized coordinates to sensor coordinates
+                            sensor_crop = self._convert_to_sensor_coordinates(crop_settings)
+                            self.camera_manager.picam2.set_controls({
+                                "ScalerCrop": sensor_crop
+                            })
+                        except Exception as e:
+                            print(f"Error updating ScalerCrop: {e}")
+                            
+            self.last_update_time = current_time
+            
     def _convert_to_sensor_coordinates(self, normalized_crop: Tuple[float, float, float, float]) -> Tuple[int, int, int, int]:
         """Convert normalized coordinates to sensor coordinates while maintaining aspect ratio"""
         sensor_width = self.camera_manager.picam2.camera_properties["ScalerCropMaximum"][2]
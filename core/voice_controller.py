@@ -127,7 +127,7 @@ class VoiceController:
         if status:
             print(f"Audio status: {status}")
         if self.running:
-            self.audio_queue.put(bytes(in_data))
+            self.audio_queue.put(in_data)  # Already bytes from PyAudio, no copy needed
         return (None, pyaudio.paContinue)
         
     def _process_audio_thread(self):
@@ -139,6 +139,9 @@ class VoiceController:
                     data = self.audio_queue.get(timeout=0.5)
                 except queue.Empty:
                     continue
+                if data is None:
+                    # Stop sentinel from stop()
+                    break
                 
                 start_time = time.monotonic()
                 
@@ -241,6 +244,8 @@ class VoiceController:
         """Stop voice recognition and cleanup"""
         print("Stopping voice controller...")
         self.running = False
+        # Wake the processing thread instead of waiting out its queue timeout
+        self.audio_queue.put(None)
         
         # Wait for processing thread to finish
         if hasattr(self, 'process_thread') and self.process_thread and self.process_thread.is_alive():
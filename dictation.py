@@ -1,25 +1,45 @@
 #!/usr/bin/env python3
 
-import vosk
-import sounddevice as sd
 import queue
 import json
+import re
 import threading
 from pathlib import Path
 import sys
 import os
-from pynput import keyboard
-from pynput.keyboard import Controller, Key
 import argparse
 
+# Heavy modules (Kaldi libs, PortAudio, X11 hooks) are imported on first
+# use so `--help` and argument errors return immediately
+vosk = None
+sd = None
+keyboard = None
+Controller = None
+Key = None
+
+# Vosk results are a tiny fixed-schema JSON object; pull out the text directly
+_TEXT_RE = re.compile(r'"text"\s*:\s*"([^"\\]*)"')
+
+def _import_heavy_modules():
+    """Import vosk, sounddevice and pynput into the module namespace"""
+    global vosk, sd, keyboard, Controller, Key
+    if vosk is not None:
+        return
+    import vosk as _vosk
+    import sounddevice as _sd
+    from pynput import keyboard as _keyboard
+    vosk, sd, keyboard = _vosk, _sd, _keyboard
+    Controller, Key = _keyboard.Controller, _keyboard.Key
+
 class DictationSystem:
     def __init__(self, model_name="vosk-model-small-en-us"):
         """Initialize the dictation system"""
+        _import_heavy_modules()
         self.keyboard = Controller()
         self.audio_queue = queue.Queue()
         self.is_listening = False
         self.running = True
-        self.is_typing = False  # New flag to track when we're typing
+        self._typing_lock = threading.Lock()  # Held while we're typing
         
         # Custom word replacements
         self.word_replacements = {
@@ -36,9 +56,32 @@ class DictationSystem:
             'chad gp t': 'ChatGPT',
         }
         
+        # All replacement phrases compiled into one alternation, longest
+        # first so multi-word phrases win over their prefixes. Phrases must
+        # be whole words; like the number pass, hyphens are ignored around
+        # the first word of a phrase only.
+        phrases = sorted(self.word_replacements, key=len, reverse=True)
+        alternatives = []
+        for phrase in phrases:
+            first, sep, rest = phrase.partition(' ')
+            alternatives.append('-*' + re.escape(first) + '-*' + re.escape(sep + rest))
+        self._replacement_re = re.compile(r'(?<!\S)(?:' + '|'.join(alternatives) + r')(?!\S)')
+        
         # Initialize audio settings
         self.samplerate = 16000
         self.blocksize = 8000
+        # Upper bound on how much queued audio is fed to Vosk in one call,
+        # so a backlog doesn't delay results (int16 mono = 2 bytes/sample)
+        self.max_batch_seconds = 1.0
+        self.max_batch_bytes = int(self.samplerate * 2 * self.max_batch_seconds)
+        
+        # Real-time scheduling for the audio path (needs CAP_SYS_NICE or root).
+        # The capture callback and the recognizer get separate cores so
+        # recognition bursts can't starve PortAudio and cause xruns.
+        self.audio_priority = 80
+        self.audio_core = 3
+        self.recognizer_core = 2
+        self._audio_thread_tuned = False
         
         # Load the model
         model_path = self._get_model_path(model_name)
@@ -46,13 +89,17 @@ class DictationSystem:
             self._download_model(model_path)
             
         try:
+            # Start kernel readahead of the model files so the disk reads
+            # overlap with audio device discovery
+            self._prefetch_model(model_path)
+            
+            # Get default input device
+            device_info = sd.query_devices(None, 'input')
+            
             print("\nLoading speech recognition model...")
             self.model = vosk.Model(model_path)
             self.recognizer = vosk.KaldiRecognizer(self.model, self.samplerate)
             print("Model loaded successfully!")
-            
-            # Get default input device
-            device_info = sd.query_devices(None, 'input')
             print(f"\nUsing audio device: {device_info['name']}")
             
         except Exception as e:
@@ -64,6 +111,23 @@ class DictationSystem:
         home = str(Path.home())
         return os.path.join(home, '.vosk', 'models', model_name)
     
+    def _prefetch_model(self, model_path):
+        """Ask the kernel to read the model files into the page cache"""
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        for root, _, files in os.walk(model_path):
+            for name in files:
+                try:
+                    fd = os.open(os.path.join(root, name), os.O_RDONLY)
+                except OSError:
+                    continue
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                except OSError:
+                    pass
+                finally:
+                    os.close(fd)
+    
     def _download_model(self, model_path):
         """Download the Vosk model"""
         print("\nDownloading speech recognition model (this may take a few minutes)...")
@@ -88,6 +152,9 @@ class DictationSystem:
             
             # Cleanup
             os.remove(zip_path)
+            
+            # Warm the page cache while the freshly extracted files are hot
+            self._prefetch_model(model_path)
             print("Model downloaded and installed successfully!")
             
         except Exception as e:
@@ -98,8 +165,22 @@ class DictationSystem:
             print(f"3. Extract to: {model_path}")
             sys.exit(1)
     
+    def _tune_current_thread(self, core, priority=None):
+        """Pin the calling thread to a core and optionally make it SCHED_FIFO"""
+        # On Linux, pid 0 targets the calling thread rather than the process
+        try:
+            if core < os.cpu_count():
+                os.sched_setaffinity(0, {core})
+            if priority is not None:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        except (AttributeError, OSError) as e:
+            print(f"Could not set real-time scheduling: {e}")
+    
     def audio_callback(self, indata, frames, time, status):
         """Callback for audio input"""
+        if not self._audio_thread_tuned:
+            self._audio_thread_tuned = True
+            self._tune_current_thread(self.audio_core, self.audio_priority)
         if status:
             print(f"Audio status: {status}")
         if self.is_listening:
@@ -121,7 +202,7 @@ class DictationSystem:
             'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90
         }
         
-        # Custom word replacements
+        # Convert spoken numbers
         words = text.lower().split()
         result_words = []
         i = 0
@@ -149,49 +230,70 @@ class DictationSystem:
                 i += 1
                 continue
             
-            # Check for three-word replacements
-            if i + 2 < len(words):
-                three_words = f"{current_word} {words[i + 1]} {words[i + 2]}"
-                if three_words in self.word_replacements:
-                    if self.word_replacements[three_words]:  # Only add if not empty
-                        result_words.append(self.word_replacements[three_words])
-                    i += 3
-                    continue
-            
-            # Check for two-word replacements
-            if i + 1 < len(words):
-                two_words = f"{current_word} {words[i + 1]}"
-                if two_words in self.word_replacements:
-                    if self.word_replacements[two_words]:  # Only add if not empty
-                        result_words.append(self.word_replacements[two_words])
-                    i += 2
-                    continue
-            
-            # Check for single word replacements
-            if current_word in self.word_replacements:
-                if self.word_replacements[current_word]:  # Only add if not empty
-                    result_words.append(self.word_replacements[current_word])
-            else:
-                # Keep original word if no replacement found
-                result_words.append(words[i])
+            result_words.append(words[i])
             i += 1
         
-        return ' '.join(result_words)
+        # Custom word replacements in a single pass over the utterance
+        text = self._replacement_re.sub(self._replace_phrase, ' '.join(result_words))
+        # Removed words leave extra spaces behind
+        return ' '.join(text.split())
+
+    def _replace_phrase(self, match):
+        """Look up the replacement for a matched phrase"""
+        first, sep, rest = match.group(0).partition(' ')
+        return self.word_replacements[first.strip('-') + sep + rest]
+
+    def _extract_text(self, result_json):
+        """Get the recognized text from a Vosk result string"""
+        match = _TEXT_RE.search(result_json)
+        if match:
+            return match.group(1)
+        # Escaped characters or an unexpected layout - use the real parser
+        return json.loads(result_json).get("text", "")
+
+    def _get_audio_batch(self):
+        """Wait for one block, then drain whatever else is queued up to the batch limit"""
+        first = self.audio_queue.get(timeout=0.5)
+        if first is None:
+            # Stop sentinel from stop_listening()
+            return None
+        try:
+            chunk = self.audio_queue.get_nowait()
+        except queue.Empty:
+            # Keeping up with capture - hand the block straight to Vosk
+            return first
+        if chunk is None:
+            return first
+        chunks = [first, chunk]
+        size = len(first) + len(chunk)
+        while size < self.max_batch_bytes:
+            try:
+                chunk = self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        # Single allocation + copy into one contiguous buffer
+        return b"".join(chunks)
 
     def process_audio(self):
         """Process audio from the queue"""
+        self._tune_current_thread(self.recognizer_core)
         while self.is_listening:
             try:
-                data = self.audio_queue.get(timeout=0.5)
+                data = self._get_audio_batch()
+                if data is None:
+                    break
                 if self.recognizer.AcceptWaveform(data):
-                    result = json.loads(self.recognizer.Result())
-                    if result["text"]:
+                    text = self._extract_text(self.recognizer.Result())
+                    if text:
                         # Process the text before typing
-                        processed_text = self._process_text(result["text"]) + " "
+                        processed_text = self._process_text(text) + " "
                         print(f"→ {processed_text}")
-                        self.is_typing = True  # Set flag before typing
-                        self.keyboard.type(processed_text)
-                        self.is_typing = False  # Reset flag after typing
+                        with self._typing_lock:
+                            self.keyboard.type(processed_text)
             except queue.Empty:
                 continue
             except Exception as e:
@@ -200,13 +302,10 @@ class DictationSystem:
     def start_listening(self):
         """Start dictation"""
         if not self.is_listening:
+            # Drop any old data by swapping in a fresh queue before the
+            # callback starts enqueuing again
+            self.audio_queue = queue.Queue()
             self.is_listening = True
-            # Clear any old data from the queue
-            while not self.audio_queue.empty():
-                try:
-                    self.audio_queue.get_nowait()
-                except queue.Empty:
-                    break
             # Start processing thread
             self.process_thread = threading.Thread(target=self.process_audio)
             self.process_thread.daemon = True  # Make thread daemon so it exits when main thread exits
@@ -217,6 +316,8 @@ class DictationSystem:
         """Stop dictation"""
         if self.is_listening:
             self.is_listening = False
+            # Wake the processing thread instead of waiting out its queue timeout
+            self.audio_queue.put(None)
             # Process any remaining audio before stopping
             try:
                 # Give a short time for any final processing
@@ -228,7 +329,7 @@ class DictationSystem:
     def on_press(self, key):
         """Handle key press events"""
         # Ignore keyboard events if we're currently typing
-        if self.is_typing:
+        if self._typing_lock.locked():
             return
             
         try:
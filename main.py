@@ -3,6 +3,7 @@ import time
 import signal
 import threading
 import sys
+from functools import partial
 from core.camera_manager import CameraManager, ZoomLevel
 from core.face_processor import CameraFaceProcessor
 from core.display_processor import DisplayProcessor
@@ -15,22 +16,29 @@ from core.scaler_crop_controller import ScalerCropController
 os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = "/usr/lib/aarch64-linux-gnu/qt5/plugins/platforms"
 os.environ["QT_QPA_PLATFORM"] = "xcb"
 
-# Global flag for shutdown
-shutdown_requested = False
-force_shutdown_timer = None
+# Set by the signal handler; main() blocks on it instead of polling
+shutdown_event = threading.Event()
+# Set once cleanup has finished; cancels the force-shutdown watchdog
+cleanup_done_event = threading.Event()
+
+def _force_shutdown_watchdog():
+    """Force exit if normal shutdown takes longer than 5 seconds"""
+    if not cleanup_done_event.wait(5.0):
+        force_shutdown()
+
+def _run_stop(name, stop):
+    """Run one component's stop(), reporting instead of raising errors"""
+    try:
+        stop()
+    except Exception as e:
+        print(f"Error stopping {name}: {e!r}")
 
 def signal_handler(sig, frame):
     """Handle Ctrl+C and other termination signals"""
-    global shutdown_requested, force_shutdown_timer
-    
-    if not shutdown_requested:
+    if not shutdown_event.is_set():
         print("\nShutdown requested. Press Ctrl+C again to force immediate exit.")
-        shutdown_requested = True
-        
-        # Set a timer for force shutdown if normal shutdown takes too long
-        force_shutdown_timer = threading.Timer(5.0, force_shutdown)
-        force_shutdown_timer.daemon = True
-        force_shutdown_timer.start()
+        shutdown_event.set()
+        threading.Thread(target=_force_shutdown_watchdog, daemon=True).start()
     else:
         # Second Ctrl+C, force immediate exit
         force_shutdown()
@@ -40,6 +48,30 @@ def force_shutdown():
     print("\nForce shutdown initiated. Exiting immediately.")
     os._exit(1)  # Force exit without cleanup
 
+def _async_worker_count():
+    """Worker pool size from MIRROR_ASYNC_WORKERS, defaulting to one less than the CPU count"""
+    default = (os.cpu_count() or 4) - 1
+    try:
+        workers = int(os.environ.get("MIRROR_ASYNC_WORKERS", default))
+    except ValueError:
+        print(f"Warning: invalid MIRROR_ASYNC_WORKERS, using {default}")
+        workers = default
+    return max(2, min(8, workers))
+
+def _focus_command(camera, distance_sensor):
+    """Focus using the distance sensor, or a fixed mid-range value without one"""
+    camera.set_focus(distance_sensor.get_current_focus() if distance_sensor is not None else 10.0)
+
+def create_voice_callbacks(camera, display_processor, distance_sensor):
+    """Map voice commands to bound callables (partials, no closures)"""
+    return {
+        VoiceCommand.EYES: partial(display_processor.set_zoom_level, ZoomLevel.EYES),
+        VoiceCommand.LIPS: partial(display_processor.set_zoom_level, ZoomLevel.LIPS),
+        VoiceCommand.FACE: partial(display_processor.set_zoom_level, ZoomLevel.FACE),
+        VoiceCommand.ZOOM_OUT: partial(display_processor.set_zoom_level, ZoomLevel.WIDE),
+        VoiceCommand.FOCUS: partial(_focus_command, camera, distance_sensor)
+    }
+
 def main():
     # Register signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
@@ -47,11 +79,11 @@ def main():
     
     print("Initializing Mirror System...")
     
-    # Initialize shared components
-    async_helper = AsyncHelper(max_workers=6)
+    # Initialize shared components (one worker pool for the whole process)
+    async_helper = AsyncHelper(max_workers=_async_worker_count())
     
     # Initialize core components
-    camera = CameraManager()
+    camera = CameraManager(async_helper=async_helper)
     scaler_crop_controller = ScalerCropController(camera)
     # Attach scaler_crop_controller to camera_manager for coordination
     camera.scaler_crop_controller = scaler_crop_controller
@@ -76,19 +108,9 @@ def main():
         distance_sensor_initialized = False
         distance_sensor = None
     
-    # Define voice command callbacks
-    def create_voice_callbacks(camera, display_processor):
-        return {
-            VoiceCommand.EYES: lambda: display_processor.set_zoom_level(ZoomLevel.EYES),
-            VoiceCommand.LIPS: lambda: display_processor.set_zoom_level(ZoomLevel.LIPS),
-            VoiceCommand.FACE: lambda: display_processor.set_zoom_level(ZoomLevel.FACE),
-            VoiceCommand.ZOOM_OUT: lambda: display_processor.set_zoom_level(ZoomLevel.WIDE),
-            VoiceCommand.FOCUS: lambda: camera.set_focus(distance_sensor.get_current_focus() if distance_sensor_initialized else 10.0)
-        }
-    
     # Initialize voice controller with callbacks
     try:
-        voice_callbacks = create_voice_callbacks(camera, display_processor)
+        voice_callbacks = create_voice_callbacks(camera, display_processor, distance_sensor)
         voice_controller = VoiceController(voice_callbacks, async_helper)
         voice_controller_initialized = True
         print("Voice controller initialized successfully")
@@ -136,48 +158,40 @@ def main():
         
         print("\nSystem ready! Press Ctrl+C to exit.")
         
-        # Main loop
-        while not shutdown_requested:
-            time.sleep(0.1)
+        # Sleep until a termination signal arrives
+        shutdown_event.wait()
             
     except KeyboardInterrupt:
         print("\nShutdown requested...")
     except Exception as e:
         print(f"\nError in main loop: {e}")
     finally:
-        # Cancel force shutdown timer if it's running
-        if force_shutdown_timer and force_shutdown_timer.is_alive():
-            force_shutdown_timer.cancel()
-        
         # Ensure clean shutdown of all components
         print("Cleaning up resources...")
         
-        # Shutdown components in reverse order of initialization
+        # Independent components are stopped concurrently so shutdown takes
+        # as long as the slowest one; camera and async helper go last
+        stops = []
         if voice_controller_initialized:
-            try:
-                print("Stopping voice controller...")
-                voice_controller.stop()
-            except Exception as e:
-                print(f"Error stopping voice controller: {e}")
-        
+            stops.append(("voice controller", voice_controller.stop))
         if distance_sensor_initialized:
-            try:
-                print("Stopping distance sensor...")
-                distance_sensor.stop()
-            except Exception as e:
-                print(f"Error stopping distance sensor: {e}")
-        
-        try:
-            print("Stopping display processor...")
-            display_processor.stop()
-        except Exception as e:
-            print(f"Error stopping display processor: {e}")
-        
-        try:
-            print("Stopping face processor...")
-            face_processor.stop()
-        except Exception as e:
-            print(f"Error stopping face processor: {e}")
+            stops.append(("distance sensor", distance_sensor.stop))
+        stops.append(("display processor", display_processor.stop))
+        stops.append(("face processor", face_processor.stop))
+        
+        # Daemon threads, so a stop that hangs past its timeout can't
+        # keep the interpreter from exiting
+        stop_threads = []
+        for name, stop in stops:
+            print(f"Stopping {name}...")
+            thread = threading.Thread(target=_run_stop, args=(name, stop), daemon=True)
+            thread.start()
+            stop_threads.append((name, thread))
+        deadline = time.monotonic() + 2.0
+        for name, thread in stop_threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                print(f"Warning: {name} did not stop within 2s")
         
         try:
             print("Stopping camera...")
@@ -187,11 +201,12 @@ def main():
         
         try:
             print("Stopping async helper...")
-            async_helper.shutdown(wait=False)  # Don't wait for tasks to complete during emergency shutdown
+            async_helper.stop()  # Doesn't wait for queued tasks to complete
         except Exception as e:
             print(f"Error stopping async helper: {e}")
         
         print("Shutdown complete")
+        cleanup_done_event.set()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
 import time
+import sys
+import select
+import termios
+import tty
 from picamera2 import Picamera2, Preview
 from libcamera import Transform
 import os
@@ -27,7 +31,9 @@ class SimpleFocusTester:
             main={"size": (1100, 1100), "format": "RGB888"},
             transform=Transform(hflip=False, vflip=True),
             buffer_count=2,
-            queue=True
+            # Don't hold a queued frame: stale frames are dropped so the
+            # preview always shows the latest focus/zoom setting
+            queue=False
         )
         
         print("Setting camera configuration...")
@@ -48,6 +54,15 @@ class SimpleFocusTester:
         self.current_zoom_level = 1  # 1 = normal, 2 = 2x zoom, 3 = 3x zoom
         self.max_zoom_level = 3
         self.zoom_center = (550, 550)  # Center of the frame (1100x1100)
+        
+        # Zoom levels and centre are fixed, so crops are computed once
+        self._crop_table = {
+            level: self._compute_crop(level)
+            for level in range(1, self.max_zoom_level + 1)
+        }
+        
+        # Controls changed since the last flush, sent in a single set_controls call
+        self._pending_controls = {}
     
     def start_camera(self):
         """Start the camera preview"""
@@ -63,8 +78,8 @@ class SimpleFocusTester:
             print("Camera started")
             time.sleep(1)  # Give camera time to stabilize
             
-            # Apply initial zoom (no zoom)
-            self.set_zoom(self.current_zoom_level)
+            # Queue initial zoom (no zoom); run_test sends it with the initial focus
+            self.set_zoom(self.current_zoom_level, force=True)
         except Exception as e:
             print(f"Error starting preview: {e}")
             try:
@@ -88,22 +103,14 @@ class SimpleFocusTester:
         self.picam2.stop()
         print("Camera stopped")
     
-    def set_zoom(self, zoom_level):
-        """Set zoom level (1-3)"""
-        self.current_zoom_level = max(1, min(self.max_zoom_level, zoom_level))
-        
-        # Calculate crop size based on zoom level
-        if self.current_zoom_level == 1:
-            # No zoom - reset ScalerCrop
-            self.picam2.set_controls({"ScalerCrop": (0, 0, self.SENSOR_WIDTH, self.SENSOR_HEIGHT)})
-            print("Zoom level: 1x (no zoom)")
-            return
-        
-        # Calculate crop size and position
-        zoom_factor = self.current_zoom_level
+    def _compute_crop(self, zoom_level):
+        """Sensor ScalerCrop rectangle for a zoom level, centred on zoom_center"""
+        if zoom_level == 1:
+            # No zoom - full sensor
+            return (0, 0, self.SENSOR_WIDTH, self.SENSOR_HEIGHT)
         
         # Calculate crop size (smaller = more zoom)
-        crop_size = min(self.SENSOR_WIDTH, self.SENSOR_HEIGHT) // zoom_factor
+        crop_size = min(self.SENSOR_WIDTH, self.SENSOR_HEIGHT) // zoom_level
         
         # Calculate center point in sensor coordinates
         center_x_ratio = self.zoom_center[0] / 1100  # Convert from preview to ratio
@@ -120,21 +127,52 @@ class SimpleFocusTester:
         crop_x = max(0, min(self.SENSOR_WIDTH - crop_size, crop_x))
         crop_y = max(0, min(self.SENSOR_HEIGHT - crop_size, crop_y))
         
-        # Apply crop
-        self.picam2.set_controls({"ScalerCrop": (crop_x, crop_y, crop_size, crop_size)})
-        print(f"Zoom level: {self.current_zoom_level}x")
+        return (crop_x, crop_y, crop_size, crop_size)
+    
+    def _flush_controls(self):
+        """Send all pending control changes to the camera in one call"""
+        if self._pending_controls:
+            self.picam2.set_controls(self._pending_controls)
+            self._pending_controls = {}
+    
+    def set_zoom(self, zoom_level, force=False):
+        """Set zoom level (1-3); unchanged levels are skipped unless forced"""
+        zoom_level = max(1, min(self.max_zoom_level, zoom_level))
+        if zoom_level == self.current_zoom_level and not force:
+            return
+        self.current_zoom_level = zoom_level
+        
+        self._pending_controls["ScalerCrop"] = self._crop_table[zoom_level]
+        if zoom_level == 1:
+            print("Zoom level: 1x (no zoom)")
+        else:
+            print(f"Zoom level: {zoom_level}x")
     
-    def set_focus(self, focus_value):
-        """Set camera focus"""
+    def set_focus(self, focus_value, force=False):
+        """Set camera focus; unchanged values are skipped unless forced"""
         # Ensure focus is within valid range
         focus_value = max(min(focus_value, self.max_focus), self.min_focus)
-        self.picam2.set_controls({"LensPosition": focus_value})
+        if abs(focus_value - self.current_focus) < 1e-6 and not force:
+            # Already there (e.g. repeated presses at the range limit)
+            print(f"Focus unchanged: {focus_value:.2f}")
+            return focus_value
+        self._pending_controls["LensPosition"] = focus_value
         self.current_focus = focus_value
         print(f"Focus set to: {focus_value:.2f}")
         return focus_value
     
+    def _read_key(self, timeout=0.05):
+        """Return a single keypress, or None if no key was pressed within timeout"""
+        fd = sys.stdin.fileno()
+        if select.select([fd], [], [], timeout)[0]:
+            # Read the fd directly: sys.stdin's buffer would swallow any
+            # further queued keys and hide them from select()
+            return os.read(fd, 1).decode(errors="ignore").lower()
+        return None
+    
     def run_test(self):
         """Run the focus test"""
+        old_term_attrs = None
         try:
             self.start_camera()
             
@@ -151,41 +189,60 @@ class SimpleFocusTester:
             
             step_size = 0.1
             
-            # Set initial focus
-            self.set_focus(self.current_focus)
+            # Set initial focus, sent together with the initial zoom
+            self.set_focus(self.current_focus, force=True)
+            self._flush_controls()
             
-            while True:
-                key = input("Command: ").strip().lower()
+            # Read single keypresses without waiting for Enter
+            old_term_attrs = termios.tcgetattr(sys.stdin)
+            tty.setcbreak(sys.stdin.fileno())
+            
+            quit_requested = False
+            while not quit_requested:
+                key = self._read_key()
+                
+                # Handle every key already buffered before sending controls,
+                # so e.g. '+' followed by 'z' goes out in one set_controls call
+                while key is not None:
+                    if key in ['+', '=']:
+                        self.set_focus(self.current_focus + step_size)
+                    elif key in ['-', '_']:
+                        self.set_focus(self.current_focus - step_size)
+                    elif key == 'f':
+                        step_size = 0.05
+                        print("Fine adjustment mode (0.05 steps)")
+                    elif key == 'c':
+                        step_size = 0.2
+                        print("Coarse adjustment mode (0.2 steps)")
+                    elif key == 'n':
+                        step_size = 0.1
+                        print("Normal adjustment mode (0.1 steps)")
+                    elif key == 'z':
+                        # Cycle through zoom levels
+                        next_zoom = (self.current_zoom_level % self.max_zoom_level) + 1
+                        self.set_zoom(next_zoom)
+                    elif key == 'd':
+                        print(f"Current focus: {self.current_focus:.2f}, Zoom: {self.current_zoom_level}x")
+                    elif key == 'q':
+                        print("Quitting focus test")
+                        quit_requested = True
+                        break
+                    elif not key.isspace():
+                        print("Unknown command. Type '+', '-', 'f', 'c', 'n', 'z', 'd', or 'q'")
+                    
+                    key = self._read_key(timeout=0)
                 
-                if key in ['+', '=']:
-                    self.set_focus(self.current_focus + step_size)
-                elif key in ['-', '_']:
-                    self.set_focus(self.current_focus - step_size)
-                elif key == 'f':
-                    step_size = 0.05
-                    print("Fine adjustment mode (0.05 steps)")
-                elif key == 'c':
-                    step_size = 0.2
-                    print("Coarse adjustment mode (0.2 steps)")
-                elif key == 'n':
-                    step_size = 0.1
-                    print("Normal adjustment mode (0.1 steps)")
-                elif key == 'z':
-                    # Cycle through zoom levels
-                    next_zoom = (self.current_zoom_level % self.max_zoom_level) + 1
-                    self.set_zoom(next_zoom)
-                elif key == 'd':
-                    print(f"Current focus: {self.current_focus:.2f}, Zoom: {self.current_zoom_level}x")
-                elif key == 'q':
-                    print("Quitting focus test")
-                    break
-                else:
-                    print("Unknown command. Type '+', '-', 'f', 'c', 'n', 'z', 'd', or 'q'")
+                self._flush_controls()
         
         finally:
-            # Reset zoom before exiting
+            # Restore line-buffered terminal input
+            if old_term_attrs is not None:
+                termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_term_attrs)
+            
+            # Reset zoom before exiting, together with any unsent focus change
             try:
                 self.set_zoom(1)
+                self._flush_controls()
             except:
                 pass
             self.stop_camera()
@@ -61,12 +61,8 @@ def test_async_helper():
         task_ids.append(task_id)
     
     # Wait for all results
-    while len(task_ids) > 0:
-        for task_id in task_ids[:]:
-            result = helper.get_result(task_id)
-            if result is not None:
-                task_ids.remove(task_id)
-        time.sleep(0.001)
+    for task_id in task_ids:
+        helper.wait_result(task_id, timeout=5.0)
     
     parallel_time = time.monotonic() - start_time
     print(f"  ✓ Processed {len(frames)} frames in {parallel_time:.3f} seconds")
@@ -74,12 +70,15 @@ def test_async_helper():
     # Test priority scheduling
     print("\n- Testing priority scheduling...")
     
+    # One shared frame for all priority tasks, same dtype as the frames above
+    test_frame = np.ones((100, 100, 3), dtype=np.uint8)
+    
     # Schedule low priority tasks
     for i in range(5):
         helper.schedule_task(
             simulate_frame_processing,
             priority=2,
-            frame=np.ones((100, 100, 3))
+            frame=test_frame
         )
     
     # Schedule high priority task
@@ -87,12 +86,11 @@ def test_async_helper():
     task_id = helper.schedule_task(
         simulate_frame_processing,
         priority=0,
-        frame=np.ones((100, 100, 3))
+        frame=test_frame
     )
     
     # Wait for high priority result
-    while helper.get_result(task_id) is None:
-        time.sleep(0.001)
+    helper.wait_result(task_id, timeout=5.0)
     
     priority_time = time.monotonic() - start_time
     print(f"  ✓ High priority task completed in {priority_time:.3f} seconds")
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import time
+import threading
 from core.distance_sensor import DistanceSensor
 
 def test_distance_sensor():
@@ -10,16 +10,16 @@ def test_distance_sensor():
     for distance, focus in sorted(ds.distance_focus_map.items()):
         print(f"  {distance:.1f}cm -> {focus:.2f}")
     
+    # Print every sample as the sensor thread produces it
+    ds.add_listener(lambda distance, focus: print(f"Distance: {distance:.1f}cm, Focus: {focus:.2f}"))
+    
     print("\nStarting distance sensor...")
     ds.start()
     
     print("Reading distance and calculating focus for 10 seconds...")
+    shutdown_event = threading.Event()
     try:
-        for i in range(10):
-            time.sleep(1)
-            distance = ds.get_current_distance()
-            focus = ds.get_current_focus()
-            print(f"Distance: {distance:.1f}cm, Focus: {focus:.2f}")
+        shutdown_event.wait(10.0)
     except KeyboardInterrupt:
         print("\nTest interrupted by user")
     finally:
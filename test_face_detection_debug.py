@@ -1,4 +1,5 @@
 import os
+import logging
 import cv2
 import numpy as np
 from core.camera_manager import CameraManager
@@ -11,34 +12,69 @@ os.environ["MEDIAPIPE_USE_GPU"] = "true"
 os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = "/usr/lib/aarch64-linux-gnu/qt5/plugins/platforms"
 os.environ["QT_QPA_PLATFORM"] = "xcb"
 
-def draw_debug_overlay(frame, face_data):
-    """Draw debug visualization on frame"""
+# Per-frame details are logged at DEBUG so they cost nothing unless enabled
+# (set FACE_DEBUG_VERBOSE=1); periodic summaries still go to stdout
+logger = logging.getLogger(__name__)
+
+# MediaPipe face detection keypoints, in detection order (BGR colors)
+_LANDMARK_COLORS = ((255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255), (0, 255, 255))
+_LANDMARK_LABELS = ('Right Eye', 'Left Eye', 'Nose', 'Mouth', 'Right Ear', 'Left Ear')
+
+# Scratch buffers reused across frames, keyed by frame shape. The camera
+# frame is shared with the face processor thread, so we can't draw on it.
+_debug_frame_buffers = {}
+_debug_rgba_buffers = {}
+
+# Draw and convert on the GPU through OpenCV's transparent API when an
+# OpenCL device is available; otherwise stay on plain numpy buffers
+_USE_OPENCL = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+
+def _scratch_buffer(buffers, shape):
+    """Get (or allocate once) a uint8 scratch buffer of the given shape"""
+    buffer = buffers.get(shape)
+    if buffer is None:
+        buffer = np.empty(shape, dtype=np.uint8)
+        buffers[shape] = buffer
+    return buffer
+
+def _project_to_pixels(bbox, landmarks, w, h):
+    """Scale normalized bbox and landmarks to integer pixel coordinates"""
+    scale = np.array([w, h], dtype=np.float32)
+    bbox_px = (np.asarray(bbox, dtype=np.float32) * np.tile(scale, 2)).astype(np.int32)
+    pts = (np.asarray(landmarks, dtype=np.float32).reshape(-1, 2) * scale).astype(np.int32)
+    return bbox_px, pts
+
+def draw_debug_overlay(frame, face_data, show_labels=False):
+    """Draw debug visualization on a copy of frame
+    
+    Landmarks are identified by color; their text labels are only drawn
+    when show_labels is set (FACE_DEBUG_VERBOSE) since text is the most
+    expensive thing to render. The confidence is always drawn.
+    The returned frame is a reused buffer, valid until the next call.
+    """
     if face_data is None or frame is None:
         return frame
     
     h, w = frame.shape[:2]
-    debug_frame = frame.copy()
+    if _USE_OPENCL:
+        debug_frame = cv2.UMat(frame)  # Upload doubles as the copy
+    else:
+        debug_frame = _scratch_buffer(_debug_frame_buffers, frame.shape)
+        np.copyto(debug_frame, frame)
+    
+    # Convert normalized coordinates to pixels in one pass
+    bbox_px, pts = _project_to_pixels(face_data.bbox, face_data.landmarks, w, h)
+    x, y, width, height = bbox_px.tolist()
     
     # Draw bounding box
-    bbox = face_data.bbox
-    x = int(bbox[0] * w)
-    y = int(bbox[1] * h)
-    width = int(bbox[2] * w)
-    height = int(bbox[3] * h)
     cv2.rectangle(debug_frame, (x, y), (x + width, y + height), (0, 255, 0), 2)
     
-    # Draw landmarks with labels
-    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255), (0, 255, 255)]
-    labels = ['Right Eye', 'Left Eye', 'Nose', 'Mouth', 'Right Ear', 'Left Ear']
-    
-    # Only draw available landmarks
-    for i, (lm_x, lm_y) in enumerate(face_data.landmarks):
-        if i < len(colors):  # Make sure we have a color for this landmark
-            px = int(lm_x * w)
-            py = int(lm_y * h)
-            cv2.circle(debug_frame, (px, py), 5, colors[i], -1)
-            cv2.putText(debug_frame, labels[i], (px + 5, py - 5),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, colors[i], 2)
+    # Draw landmarks (only those we have a color for)
+    for i, (px, py) in enumerate(pts[:len(_LANDMARK_COLORS)].tolist()):
+        cv2.circle(debug_frame, (px, py), 5, _LANDMARK_COLORS[i], -1)
+        if show_labels:
+            cv2.putText(debug_frame, _LANDMARK_LABELS[i], (px + 5, py - 5),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, _LANDMARK_COLORS[i], 2)
     
     # Draw confidence
     cv2.putText(debug_frame, f"Confidence: {face_data.confidence:.2f}",
@@ -46,7 +82,21 @@ def draw_debug_overlay(frame, face_data):
     
     return debug_frame
 
+def debug_frame_to_rgba(debug_frame):
+    """Convert a debug frame (ndarray or UMat) to an RGBA ndarray for the overlay"""
+    if isinstance(debug_frame, cv2.UMat):
+        # Convert on the device, then download once
+        return cv2.cvtColor(debug_frame, cv2.COLOR_BGR2RGBA).get()
+    h, w = debug_frame.shape[:2]
+    return cv2.cvtColor(debug_frame, cv2.COLOR_BGR2RGBA,
+                        dst=_scratch_buffer(_debug_rgba_buffers, (h, w, 4)))
+
 def main():
+    verbose = bool(os.environ.get("FACE_DEBUG_VERBOSE"))
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(message)s"
+    )
     print("\nFace Detection Debug Test")
     print("------------------------")
     
@@ -66,23 +116,33 @@ def main():
         face_processor.start()
         time.sleep(1)  # Wait for processor
         
+        print(f"\nOpenCL drawing: {'enabled' if _USE_OPENCL else 'not available'}")
         print("\nDebug Test Running")
         print("------------------")
         print("Press Ctrl+C to stop the test")
+        print("Landmark colors (BGR): Right Eye=blue, Left Eye=green, Nose=red,")
+        print("  Mouth=cyan, Right Ear=magenta, Left Ear=yellow")
         
         # Performance tracking
         frame_count = 0
         face_count = 0
-        start_time = time.monotonic()
-        last_stats_time = start_time
-        last_frame_check = start_time
+        # Throttling uses integer nanoseconds
+        start_ns = time.monotonic_ns()
+        last_stats_ns = start_ns
+        last_frame_check_ns = start_ns
+        last_overlay_ns = 0
+        overlay_interval_ns = 200_000_000  # Update overlay at 5fps, like test_face_processor.py
+        last_seq = -1  # Sequence number of the face data last drawn
         
         while True:
+            # Sleep until the camera delivers a new frame
+            camera.frame_ready.wait(timeout=0.1)
+            camera.frame_ready.clear()
             frame = camera.get_latest_frame()
-            current_time = time.monotonic()
+            current_ns = time.monotonic_ns()
             
             # Check frame acquisition every second
-            if current_time - last_frame_check >= 1.0:
+            if current_ns - last_frame_check_ns >= 1_000_000_000:
                 if frame is not None:
                     print(f"\nFrame Info:")
                     print(f"- Shape: {frame.shape}")
@@ -90,55 +150,49 @@ def main():
                     print(f"- Range: [{frame.min()}, {frame.max()}]")
                 else:
                     print("WARNING: Received None frame")
-                last_frame_check = current_time
+                last_frame_check_ns = current_ns
             
             if frame is not None:
                 frame_count += 1
                 
                 # Get face data and log the result
-                print("\nAttempting face detection...")
                 try:
-                    print("DEBUG: Before get_current_face_data call")
                     face_data = face_processor.get_current_face_data()
-                    print("DEBUG: After get_current_face_data call")
                     
-                    if face_data is None:
-                        print("DEBUG: Face data is None, checking processor state:")
-                        print(f"- Face processor running: {face_processor.running}")
-                        print(f"- Processing thread alive: {face_processor.processing_thread and face_processor.processing_thread.is_alive()}")
-                    else:
-                        print("DEBUG: Face data retrieved successfully")
-                except Exception as e:
-                    print(f"ERROR in face detection: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    if face_data is None and logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Face data is None, processor running: %s, thread alive: %s",
+                                     face_processor.running,
+                                     face_processor.processing_thread is not None and face_processor.processing_thread.is_alive())
+                except Exception:
+                    logger.exception("ERROR in face detection")
                     face_data = None
                 
                 if face_data is not None:
                     face_count += 1
-                    print(f"\nFace Detected!")
-                    print(f"- Confidence: {face_data.confidence:.2f}")
-                    print(f"- Bounding Box: {[f'{x:.2f}' for x in face_data.bbox]}")
-                    print(f"- Number of Landmarks: {len(face_data.landmarks)}")
+                    logger.debug("Face detected: confidence %.2f, bbox %s, %d landmarks",
+                                 face_data.confidence, face_data.bbox, len(face_data.landmarks))
                     
-                    # Create debug visualization
-                    try:
-                        debug_frame = draw_debug_overlay(frame, face_data)
-                        if debug_frame is not None:
-                            # Convert to RGBA for overlay
-                            debug_rgba = cv2.cvtColor(debug_frame, cv2.COLOR_BGR2RGBA)
-                            camera.picam2.set_overlay(debug_rgba)
-                            print("Debug overlay applied successfully")
-                        else:
-                            print("WARNING: Debug overlay creation failed")
-                    except Exception as e:
-                        print(f"ERROR: Failed to create/apply debug overlay: {e}")
+                    # Create debug visualization (throttled - conversion and upload are full-frame)
+                    if face_data.seq != last_seq and current_ns - last_overlay_ns >= overlay_interval_ns:
+                        try:
+                            debug_frame = draw_debug_overlay(frame, face_data, show_labels=verbose)
+                            if debug_frame is not None:
+                                # Convert to RGBA for overlay
+                                debug_rgba = debug_frame_to_rgba(debug_frame)
+                                camera.picam2.set_overlay(debug_rgba)
+                                logger.debug("Debug overlay applied")
+                            else:
+                                logger.warning("WARNING: Debug overlay creation failed")
+                        except Exception as e:
+                            logger.error("ERROR: Failed to create/apply debug overlay: %s", e)
+                        last_overlay_ns = current_ns
+                        last_seq = face_data.seq
                 else:
-                    print("No face detected in this frame")
+                    logger.debug("No face detected in this frame")
                 
                 # Print performance stats every 5 seconds
-                if current_time - last_stats_time >= 5.0:
-                    elapsed = current_time - start_time
+                if current_ns - last_stats_ns >= 5_000_000_000:
+                    elapsed = (current_ns - start_ns) / 1e9
                     fps = frame_count / elapsed
                     face_rate = face_count / elapsed
                     
@@ -152,10 +206,8 @@ def main():
                     # Reset counters
                     frame_count = 0
                     face_count = 0
-                    start_time = current_time
-                    last_stats_time = current_time
-            
-            time.sleep(0.01)  # Small sleep to prevent CPU thrashing
+                    start_ns = current_ns
+                    last_stats_ns = current_ns
             
     except KeyboardInterrupt:
         print("\nTest stopped by user")
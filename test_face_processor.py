@@ -9,6 +9,9 @@ from core.face_processor import CameraFaceProcessor
 os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = "/usr/lib/aarch64-linux-gnu/qt5/plugins/platforms"
 os.environ["QT_QPA_PLATFORM"] = "xcb"
 
+# Overlay buffers reused across calls, keyed by (height, width)
+_OVERLAY_CACHE = {}
+
 def draw_face_data(frame, face_data):
     """Draw face detection visualization on frame"""
     if face_data is None:
@@ -17,22 +20,24 @@ def draw_face_data(frame, face_data):
     h, w = frame.shape[:2]
     bbox = face_data.bbox
     
-    # Create a transparent overlay
-    overlay = np.zeros((h, w, 4), dtype=np.uint8)
+    # Reuse a transparent overlay of this size, clearing the previous drawing
+    overlay = _OVERLAY_CACHE.get((h, w))
+    if overlay is None:
+        overlay = np.zeros((h, w, 4), dtype=np.uint8)
+        _OVERLAY_CACHE[(h, w)] = overlay
+    else:
+        overlay.fill(0)
     
-    # Convert normalized coordinates to pixel coordinates
-    x = int(bbox[0] * w)
-    y = int(bbox[1] * h)
-    width = int(bbox[2] * w)
-    height = int(bbox[3] * h)
+    # Convert normalized coordinates to pixel coordinates in one pass
+    scale = np.array([w, h], dtype=np.float32)
+    x, y, width, height = (np.asarray(bbox, dtype=np.float32) * np.tile(scale, 2)).astype(np.int32).tolist()
+    pts = (np.asarray(face_data.landmarks, dtype=np.float32).reshape(-1, 2) * scale).astype(np.int32)
     
     # Draw bounding box (green with alpha)
     cv2.rectangle(overlay, (x, y), (x + width, y + height), (0, 255, 0, 255), 2)
     
     # Draw landmarks (red with alpha)
-    for lm in face_data.landmarks:
-        lm_x = int(lm[0] * w)
-        lm_y = int(lm[1] * h)
+    for lm_x, lm_y in pts.tolist():
         cv2.circle(overlay, (lm_x, lm_y), 5, (0, 0, 255, 255), -1)
     
     # Draw confidence text
@@ -63,15 +68,15 @@ def main():
         print("3. Red dots for facial landmarks")
         print("4. Confidence score above the face")
         
-        last_overlay_time = 0
-        overlay_interval = 0.2  # Update overlay at 5fps
+        last_overlay_ns = 0
+        overlay_interval_ns = 200_000_000  # Update overlay at 5fps
         
         # Main loop - update overlay with face detection
         while True:
-            current_time = time.monotonic()
+            current_ns = time.monotonic_ns()
             
             # Only update overlay at specified interval
-            if current_time - last_overlay_time >= overlay_interval:
+            if current_ns - last_overlay_ns >= overlay_interval_ns:
                 face_data = face_processor.get_current_face_data()
                 if face_data:
                     frame = camera.get_latest_frame()
@@ -79,10 +84,10 @@ def main():
                         overlay = draw_face_data(frame, face_data)
                         if overlay is not None:
                             camera.picam2.set_overlay(overlay)
-                last_overlay_time = current_time
+                last_overlay_ns = current_ns
             
-            # Small sleep to prevent CPU thrashing
-            time.sleep(0.001)
+            # Sleep until the next overlay update is due
+            time.sleep(max(0, overlay_interval_ns - (time.monotonic_ns() - last_overlay_ns)) / 1e9)
                 
     except KeyboardInterrupt:
         print("\nInterrupted by user")
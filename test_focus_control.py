@@ -64,26 +64,30 @@ def test_focus_control():
     
     try:
         # Main loop - update focus based on distance sensor
-        last_print_time = 0
-        print_interval = 0.5  # Only print every 0.5 seconds to reduce console spam
+        last_print_ns = 0
+        print_interval_ns = 500_000_000  # Only print every 0.5 seconds to reduce console spam
+        last_focus = None
+        focus_deadband = 0.05  # Smaller changes aren't worth a set_controls round-trip
         
         while True:
-            current_time = time.monotonic()
+            current_ns = time.monotonic_ns()
             
             # Get current distance and focus
             distance = distance_sensor.get_current_distance()
             focus = distance_sensor.get_current_focus()
             
-            # Update camera focus
-            picam2.set_controls({"LensPosition": focus})
+            # Update camera focus only when it meaningfully changes
+            if last_focus is None or abs(focus - last_focus) >= focus_deadband:
+                picam2.set_controls({"LensPosition": focus})
+                last_focus = focus
             
             # Print current values (but not too often)
-            if current_time - last_print_time >= print_interval:
+            if current_ns - last_print_ns >= print_interval_ns:
                 print(f"Distance: {distance:.1f}cm, Focus: {focus:.2f}", end="\r", flush=True)
-                last_print_time = current_time
+                last_print_ns = current_ns
             
-            # Short delay
-            time.sleep(0.05)  # Reduced from 0.1 to be more responsive but not print as often
+            # Match the distance sensor's 10Hz sample rate
+            time.sleep(distance_sensor.sample_interval)
             
     except KeyboardInterrupt:
         print("\n\nStopping test...")
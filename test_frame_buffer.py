@@ -55,9 +55,14 @@ def test_frame_buffer():
     # Test thread safety
     print("\nTesting thread safety:")
     
+    # Rotate through a small preallocated pool like camera DMA buffers,
+    # instead of allocating a new frame per iteration
+    pool = [np.empty((100, 100, 3), dtype=np.uint8) for _ in range(3)]
+    
     def producer():
         for i in range(100):
-            frame = np.ones((100, 100, 3), dtype=np.uint8) * i
+            frame = pool[i % 3]
+            frame.fill(i & 0xFF)
             buffer.add_frame(frame)
             time.sleep(0.001)
     
@@ -81,6 +86,8 @@ def test_frame_buffer():
     producer_thread.join()
     consumer_thread.join()
     
+    # The buffer is zero-copy: it hands back the producer's array itself
+    assert buffer.get_latest_frame() is pool[99 % 3], "Buffer should store frame references, not copies"
     print("  ✓ Thread safety test completed")
     
     # Test clear operation
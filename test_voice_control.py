@@ -1,4 +1,4 @@
-import time
+import threading
 from core.voice_controller import VoiceController, VoiceCommand
 
 def main():
@@ -45,9 +45,8 @@ def main():
         print("- 'focus' to trigger focus")
         print("\nPress Ctrl+C to quit\n")
         
-        # Keep the program running
-        while True:
-            time.sleep(0.1)
+        # Keep the program running until Ctrl+C
+        threading.Event().wait()
             
     except KeyboardInterrupt:
         print("\nStopping test...")
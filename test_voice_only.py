@@ -1,24 +1,23 @@
 #!/usr/bin/env python3
 
 import os
-import time
 import threading
 import json
-import queue
+import re
 import signal
 import sys
 from vosk import Model, KaldiRecognizer
 import pyaudio
 from enum import Enum
+from collections import deque
 
 # Set up signal handling for clean exit
-shutdown_requested = False
+shutdown_event = threading.Event()
 
 def signal_handler(sig, frame):
-    global shutdown_requested
-    if not shutdown_requested:
+    if not shutdown_event.is_set():
         print("\nShutdown requested. Press Ctrl+C again to force exit.")
-        shutdown_requested = True
+        shutdown_event.set()
     else:
         print("\nForce exiting...")
         os._exit(1)
@@ -34,13 +33,28 @@ class VoiceCommand(Enum):
     ZOOM_OUT = "zoom out"
     FOCUS = "focus"
 
+# All command keywords in one compiled pattern. Substring match like before,
+# so "eye" still matches "eyes". The lookahead reports overlapping keywords
+# too, so the winner can be picked the way VoiceController does: first
+# matching command in enum order, not leftmost in the text.
+_KEYWORD_TO_COMMAND = {command.value: command for command in VoiceCommand}
+_COMMAND_PRIORITY = {command: i for i, command in enumerate(VoiceCommand)}
+_COMMAND_RE = re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in _KEYWORD_TO_COMMAND) + '))')
+
 class SimpleVoiceController:
     """
     Simplified voice controller for testing
     """
     def __init__(self):
         self.running = False
-        self.audio_queue = queue.Queue()
+        # Bounded audio buffer: if recognition falls behind, the oldest chunks
+        # are dropped instead of blocking the callback or growing memory.
+        # Sized in start() from the chunk size actually opened.
+        self.audio_buffer = deque()
+        self.max_backlog_seconds = 8.0  # Audio kept while recognition lags
+        self.audio_ready = threading.Event()
+        self.dropped_chunks = 0
+        self.frames_per_buffer_options = (1600, 3200)  # 100ms, 200ms at 16kHz
         self.process_thread = None
         
         # Find Vosk model
@@ -106,60 +120,74 @@ class SimpleVoiceController:
         """Callback for audio input"""
         if status:
             print(f"Audio status: {status}")
-        self.audio_queue.put(bytes(in_data))
+        if len(self.audio_buffer) == self.audio_buffer.maxlen:
+            self.dropped_chunks += 1  # Oldest chunk is evicted by append
+        self.audio_buffer.append(in_data)  # PyAudio already hands us an immutable bytes object
+        self.audio_ready.set()
         return (None, pyaudio.paContinue)
     
     def process_audio(self):
-        """Process audio from the queue"""
-        while self.running and not shutdown_requested:
-            try:
-                data = self.audio_queue.get(timeout=0.5)
-                if self.recognizer.AcceptWaveform(data):
-                    result = json.loads(self.recognizer.Result())
-                    text = result.get("text", "")
-                    
-                    if text:
-                        print(f"\n👂 Heard: '{text}'")
-                        
-                        # Check for commands
-                        text = text.lower()
-                        for command in VoiceCommand:
-                            if command.value in text:
-                                print(f"🎤 Command detected: {command.name}")
-                                break
-                        else:
-                            print("❌ No command recognized")
-            except queue.Empty:
+        """Process audio from the buffer"""
+        while self.running and not shutdown_event.is_set():
+            # Wait for the callback to signal new audio
+            if not self.audio_ready.wait(timeout=0.5):
                 continue
-            except Exception as e:
-                print(f"Error processing audio: {e}")
-                # Try to reset the recognizer
+            self.audio_ready.clear()
+            
+            while self.audio_buffer:
+                data = self.audio_buffer.popleft()
                 try:
-                    self.recognizer = KaldiRecognizer(self.model, 16000)
-                    print("Recognizer reset after error")
-                except:
-                    print("Failed to reset recognizer")
+                    if self.recognizer.AcceptWaveform(data):
+                        result = json.loads(self.recognizer.Result())
+                        text = result.get("text", "")
+                        
+                        if text:
+                            print(f"\n👂 Heard: '{text}'")
+                            
+                            # Check for commands
+                            commands = [_KEYWORD_TO_COMMAND[match.group(1)]
+                                        for match in _COMMAND_RE.finditer(text.lower())]
+                            if commands:
+                                command = min(commands, key=_COMMAND_PRIORITY.__getitem__)
+                                print(f"🎤 Command detected: {command.name}")
+                            else:
+                                print("❌ No command recognized")
+                except Exception as e:
+                    print(f"Error processing audio: {e}")
+                    # Try to reset the recognizer
+                    try:
+                        self.recognizer = KaldiRecognizer(self.model, 16000)
+                        print("Recognizer reset after error")
+                    except:
+                        print("Failed to reset recognizer")
     
     def start(self):
         """Start voice recognition"""
         if not self.running:
             self.running = True
             
-            # Start audio stream
-            try:
-                self.stream = self.audio.open(
-                    format=pyaudio.paInt16,
-                    channels=1,
-                    rate=16000,
-                    input=True,
-                    input_device_index=None,  # Use default
-                    frames_per_buffer=8000,  # Larger buffer like dictation.py
-                    stream_callback=self.audio_callback
-                )
-                self.stream.start_stream()
-                print("Audio stream started")
-            except Exception as e:
-                print(f"Error starting audio stream: {e}")
+            # Start audio stream with small buffers (100ms) so commands reach
+            # Vosk sooner; fall back to 200ms if the device rejects 100ms
+            for frames_per_buffer in self.frames_per_buffer_options:
+                # Same backlog time budget whatever the chunk size
+                chunk_seconds = frames_per_buffer / 16000
+                self.audio_buffer = deque(maxlen=max(1, round(self.max_backlog_seconds / chunk_seconds)))
+                try:
+                    self.stream = self.audio.open(
+                        format=pyaudio.paInt16,
+                        channels=1,
+                        rate=16000,
+                        input=True,
+                        input_device_index=None,  # Use default
+                        frames_per_buffer=frames_per_buffer,
+                        stream_callback=self.audio_callback
+                    )
+                    self.stream.start_stream()
+                    print(f"Audio stream started ({frames_per_buffer} frames per buffer)")
+                    break
+                except Exception as e:
+                    print(f"Error starting audio stream with {frames_per_buffer} frames per buffer: {e}")
+            else:
                 self.running = False
                 return False
             
@@ -175,6 +203,8 @@ class SimpleVoiceController:
         """Stop voice recognition and cleanup"""
         print("Stopping voice controller...")
         self.running = False
+        # Wake the processing thread instead of waiting out its timeout
+        self.audio_ready.set()
         
         # Wait for processing thread to finish
         if self.process_thread and self.process_thread.is_alive():
@@ -183,6 +213,9 @@ class SimpleVoiceController:
             except:
                 print("Warning: Could not join processing thread")
         
+        if self.dropped_chunks:
+            print(f"Warning: dropped {self.dropped_chunks} audio chunks (recognition lagged)")
+        
         # Clean up audio resources
         try:
             if hasattr(self, 'stream'):
@@ -220,9 +253,8 @@ def main():
         if controller.start():
             print("\nListening for commands...")
             
-            # Main loop
-            while not shutdown_requested:
-                time.sleep(0.1)
+            # Block until a signal requests shutdown
+            shutdown_event.wait()
                 
     except Exception as e:
         print(f"Error: {e}")
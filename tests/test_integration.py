@@ -1,32 +1,71 @@
 import unittest
 from unittest.mock import Mock, patch
 import time
+from functools import cached_property
+from types import MappingProxyType
 import numpy as np
 import cv2
+from dataclasses import dataclass
 from core.camera_manager import CameraManager, ZoomLevel
 from core.face_processor import CameraFaceProcessor
 from core.display_processor import DisplayProcessor
 from core.scaler_crop_controller import ScalerCropController
 from picamera2 import Picamera2
 
-class TestMirrorIntegration(unittest.TestCase):
-    @patch('core.camera_manager.Picamera2')
-    def setUp(self, mock_picam2_class):
-        """Set up test environment with mock camera"""
-        # Create a mock camera instance
-        self.mock_picam2 = mock_picam2_class.return_value
-        self.mock_picam2.camera_properties = {
-            "ScalerCropMaximum": (0, 0, 4056, 3040)
-        }
+# Static mocked camera properties, shared read-only by every test
+_SENSOR_W, _SENSOR_H = 4056, 3040
+_CAMERA_PROPERTIES = MappingProxyType({
+    "ScalerCropMaximum": (0, 0, _SENSOR_W, _SENSOR_H)
+})
+
+@dataclass(slots=True)
+class FaceStub:
+    """Lightweight stand-in for FaceData without Mock attribute overhead"""
+    bbox: list  # [xmin, ymin, width, height]
+    landmarks: list
+    confidence: float
+    seq: int = 0  # Set by FaceProcessor._smooth_face_data
+
+class _MirrorTestCase(unittest.TestCase):
+    """Shared mock camera and pipeline fixtures"""
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared test frame once for all tests"""
+        # The tests only run tiny ops; keep OpenCV from spinning up its
+        # thread pool, and restore the setting for whatever runs next
+        cls.addClassCleanup(cv2.setNumThreads, cv2.getNumThreads())
+        cv2.setNumThreads(1)
         
         # Create test frame with a "face"
-        self.test_frame = np.zeros((1100, 1100, 3), dtype=np.uint8)
-        cv2.circle(self.test_frame, (550, 550), 200, (255, 255, 255), -1)  # White circle as "face"
+        cls._test_frame = np.zeros((1100, 1100, 3), dtype=np.uint8)
+        cv2.circle(cls._test_frame, (550, 550), 200, (255, 255, 255), -1)  # White circle as "face"
+        # Shared between tests, so make sure none of them can modify it
+        cls._test_frame.flags.writeable = False
+        
+        # Patch Picamera2 once for the whole class; setUp only resets it
+        picam2_patcher = patch('core.camera_manager.Picamera2')
+        cls._mock_picam2_class = picam2_patcher.start()
+        cls.addClassCleanup(picam2_patcher.stop)
+        
+    def setUp(self):
+        """Set up test environment with mock camera"""
+        # Reset the shared mock camera instance
+        self._mock_picam2_class.reset_mock()
+        self.mock_picam2 = self._mock_picam2_class.return_value
+        self.sensor_w, self.sensor_h = _SENSOR_W, _SENSOR_H
+        self.mock_picam2.camera_properties = _CAMERA_PROPERTIES
+        
+        self.test_frame = self._test_frame
         
         # Mock camera capture and other methods
         self.mock_picam2.capture_array = Mock(return_value=self.test_frame)
         self.mock_picam2.capture_frame = Mock(return_value=self.test_frame)
-        self.mock_picam2.set_controls = Mock()
+        # Record every ScalerCrop sent to the camera
+        self.scaler_crop_history = []
+        def record_controls(controls):
+            if "ScalerCrop" in controls:
+                self.scaler_crop_history.append(controls["ScalerCrop"])
+        self.mock_picam2.set_controls = Mock(side_effect=record_controls)
         self.mock_picam2.start = Mock()
         self.mock_picam2.stop = Mock()
         
@@ -51,17 +90,29 @@ class TestMirrorIntegration(unittest.TestCase):
             {'size': (4624, 3472), 'format': 'SRGGB10_CSI2P', 'fps': 10.0}
         ]
         
-        # Initialize components
-        self.camera = CameraManager()
+    # Components are built on first access, so each test only pays for
+    # the parts of the pipeline it actually uses
+    @cached_property
+    def camera(self):
+        return CameraManager()
+        
+    @cached_property
+    def scaler_crop_controller(self):
+        return ScalerCropController(self.camera)
         
-        self.scaler_crop_controller = ScalerCropController(self.camera)
-        self.face_processor = CameraFaceProcessor(self.camera, self.scaler_crop_controller)
-        self.display_processor = DisplayProcessor(self.camera, self.face_processor)
+    @cached_property
+    def face_processor(self):
+        return CameraFaceProcessor(self.camera, self.scaler_crop_controller)
         
+    @cached_property
+    def display_processor(self):
+        return DisplayProcessor(self.camera, self.face_processor)
+
+class TestMirrorIntegration(_MirrorTestCase):
     def test_display_path_latency(self):
         """Test latency of the critical display path"""
         # Mock face data
-        mock_face_data = Mock(
+        mock_face_data = FaceStub(
             bbox=[0.4, 0.4, 0.2, 0.2],
             landmarks=[(0.45, 0.45),  # left eye
                       (0.55, 0.45),   # right eye
@@ -70,6 +121,8 @@ class TestMirrorIntegration(unittest.TestCase):
             confidence=0.9
         )
         self.face_processor.get_current_face_data = Mock(return_value=mock_face_data)
+        # Build the display processor before timing the path
+        display_processor = self.display_processor
         
         start_time = time.monotonic()
         
@@ -77,7 +130,7 @@ class TestMirrorIntegration(unittest.TestCase):
         frame = self.camera.get_latest_frame_direct()
         
         # Process through display path
-        display_frame = self.display_processor._software_crop_for_display(frame)
+        display_frame = display_processor._software_crop_for_display(frame)
         
         end_time = time.monotonic()
         latency = (end_time - start_time) * 1000  # Convert to milliseconds
@@ -85,38 +138,10 @@ class TestMirrorIntegration(unittest.TestCase):
         print(f"Display path latency: {latency:.2f}ms")
         self.assertLess(latency, 33.3)  # Should be less than one frame at 30 FPS
         
-    def test_face_processing_rate(self):
-        """Verify face processing runs at expected rate"""
-        processed_frames = []
-        start_time = time.monotonic()
-        
-        # Mock frame processing
-        def mock_process_frame(frame):
-            processed_frames.append(time.monotonic())
-            return Mock(bbox=[0.4, 0.4, 0.2, 0.2], landmarks=[(0.5, 0.5)], confidence=0.9)
-            
-        # Mock get_latest_frame to return frames at 30 FPS
-        def mock_get_latest_frame():
-            return self.test_frame
-            
-        self.camera.get_latest_frame = Mock(side_effect=mock_get_latest_frame)
-        
-        with patch.object(self.face_processor, 'process_frame', side_effect=mock_process_frame):
-            self.face_processor.start()
-            time.sleep(1.1)  # Slightly over 1 second
-            self.face_processor.stop()
-            
-        # Calculate actual FPS
-        frame_times = np.diff(processed_frames)
-        avg_fps = 1.0 / np.mean(frame_times)
-        
-        print(f"Face processing rate: {avg_fps:.1f} FPS")
-        self.assertAlmostEqual(avg_fps, 5.0, delta=0.5)  # Should be close to 5 FPS
-        
     def test_crop_coordination(self):
         """Test coordination between hardware and software cropping"""
         # Mock face detection result
-        face_data = Mock(
+        face_data = FaceStub(
             bbox=[0.4, 0.4, 0.2, 0.2],  # Face taking up 20% of frame
             landmarks=[(0.45, 0.45),  # left eye
                       (0.55, 0.45),   # right eye
@@ -139,13 +164,7 @@ class TestMirrorIntegration(unittest.TestCase):
                 self.mock_picam2.set_controls({"ScalerCrop": sensor_crop})
         
         # Verify set_controls was called with ScalerCrop
-        calls = self.mock_picam2.set_controls.call_args_list
-        scaler_crop_calls = [call for call in calls if 'ScalerCrop' in call[0][0]]
-        self.assertTrue(len(scaler_crop_calls) > 0, "No ScalerCrop updates were made")
-        
-        # Get the hardware crop settings from the last ScalerCrop call
-        last_crop_call = scaler_crop_calls[-1][0][0]
-        self.assertIn('ScalerCrop', last_crop_call)
+        self.assertTrue(len(self.scaler_crop_history) > 0, "No ScalerCrop updates were made")
         
         # Get a frame and apply software crop
         frame = self.camera.get_latest_frame_direct()
@@ -157,9 +176,8 @@ class TestMirrorIntegration(unittest.TestCase):
         sw_crop_ratio = sw_target_size / w
         
         # Calculate hardware crop ratio from ScalerCrop settings
-        hw_crop = last_crop_call['ScalerCrop']
-        sensor_width = self.mock_picam2.camera_properties["ScalerCropMaximum"][2]
-        hw_crop_ratio = hw_crop[2] / sensor_width  # width ratio in sensor coordinates
+        hw_crop = self.scaler_crop_history[-1]
+        hw_crop_ratio = hw_crop[2] / self.sensor_w  # width ratio in sensor coordinates
         
         # Hardware crop should be larger (more zoomed out) than software crop
         # This ensures the hardware crop captures enough area for the software crop to work with
@@ -169,7 +187,7 @@ class TestMirrorIntegration(unittest.TestCase):
     def test_zoom_level_coordination(self):
         """Test coordination between display processor and scaler crop controller during zoom changes"""
         # Mock face detection result
-        face_data = Mock(
+        face_data = FaceStub(
             bbox=[0.4, 0.4, 0.2, 0.2],
             landmarks=[(0.45, 0.45),  # left eye
                       (0.55, 0.45),   # right eye
@@ -184,49 +202,120 @@ class TestMirrorIntegration(unittest.TestCase):
         # Test different zoom levels
         zoom_levels = [ZoomLevel.WIDE, ZoomLevel.FACE, ZoomLevel.EYES, ZoomLevel.LIPS]
         
-        for zoom_level in zoom_levels:
-            print(f"\nTesting {zoom_level}:")
-            # Change zoom level on both components
-            self.display_processor.set_zoom_level(zoom_level)
-            self.scaler_crop_controller.set_zoom_level(zoom_level)
-            
-            # Update crop
-            self.scaler_crop_controller.update_target_crop(face_data)
-            with self.scaler_crop_controller.lock:
-                crop_settings = self.scaler_crop_controller._smooth_crop_update()
-                if crop_settings:
-                    sensor_crop = self.scaler_crop_controller._convert_to_sensor_coordinates(crop_settings)
-                    self.mock_picam2.set_controls({"ScalerCrop": sensor_crop})
-            
-            # Get frame and process
-            frame = self.camera.get_latest_frame_direct()
-            display_frame = self.display_processor._software_crop_for_display(frame)
-            
-            # Verify frame shapes
-            self.assertEqual(display_frame.shape[:2], frame.shape[:2])
+        # The mocked camera always returns the same frame, so fetch it once
+        frame = self.camera.get_latest_frame_direct()
+        
+        # Calculate expected software crop ratios for all zoom levels at once
+        h, w = frame.shape[:2]
+        face_w = face_data.bbox[2] * w
+        zooms = np.array([self.display_processor.zoom_ratios[z] for z in zoom_levels])
+        sw_crop_ratios = np.floor(face_w * zooms) / w
+        
+        # Bind the components and methods used on every iteration
+        display_processor = self.display_processor
+        controller = self.scaler_crop_controller
+        set_controls = self.mock_picam2.set_controls
+        
+        for zoom_level, sw_crop_ratio in zip(zoom_levels, sw_crop_ratios):
+            with self.subTest(zoom=zoom_level):
+                print(f"\nTesting {zoom_level}:")
+                # Change zoom level on both components
+                display_processor.set_zoom_level(zoom_level)
+                controller.set_zoom_level(zoom_level)
+                
+                # Update crop
+                controller.update_target_crop(face_data)
+                with controller.lock:
+                    crop_settings = controller._smooth_crop_update()
+                    if crop_settings:
+                        sensor_crop = controller._convert_to_sensor_coordinates(crop_settings)
+                        set_controls({"ScalerCrop": sensor_crop})
+                
+                # Process the frame
+                display_frame = display_processor._software_crop_for_display(frame)
+                
+                # Verify frame shapes
+                self.assertEqual(display_frame.shape[:2], frame.shape[:2])
+                
+                # Verify crop ratios for this zoom level
+                hw_crop = self.scaler_crop_history[-1]
+                hw_crop_ratio = hw_crop[2] / self.sensor_w
+                
+                print(f"Hardware crop ratio: {hw_crop_ratio:.3f}")
+                print(f"Software crop ratio: {sw_crop_ratio:.3f}")
+                
+                # Hardware crop should always be larger than software crop
+                self.assertGreater(hw_crop_ratio, sw_crop_ratio,
+                                   f"Hardware crop for {zoom_level} should be larger than software crop")
+
+    def test_buffer_management(self):
+        """Test frame buffer handling under load"""
+        # Overfill buffer with frames
+        self.camera.frame_buffer.add_frames(
+            [self.test_frame] * (self.camera.frame_buffer.buffer_size + 1)
+        )
             
-            # Verify crop ratios for each zoom level
-            hw_crop = self.mock_picam2.set_controls.call_args_list[-1][0][0]['ScalerCrop']
-            sensor_width = self.mock_picam2.camera_properties["ScalerCropMaximum"][2]
-            hw_crop_ratio = hw_crop[2] / sensor_width
+        # Verify buffer size remains within limits
+        self.assertLessEqual(
+            self.camera.frame_buffer.get_size(),
+            self.camera.frame_buffer.buffer_size
+        )
+        
+        # Verify we can always get the latest frame
+        latest_frame = self.camera.get_latest_frame()
+        self.assertIsNotNone(latest_frame)
+
+class TestMirrorTiming(_MirrorTestCase):
+    """Rate and pipeline timing checks, kept separate so they can run in parallel"""
+    def test_face_processing_rate(self):
+        """Verify face processing runs at expected rate"""
+        processed_frames = []
+        num_frames = 10
+        
+        # Drive the processing loop from a fake clock that only advances
+        # when the loop sleeps, so the measured rate is deterministic
+        clock = [0.0]
+        fake_time = Mock()
+        fake_time.monotonic = Mock(side_effect=lambda: clock[0])
+        def fake_sleep(seconds):
+            clock[0] += seconds
+            # Fail via the frame count below instead of spinning forever
+            # if the loop stops reaching process_frame
+            if clock[0] > 5.0:
+                self.face_processor.running = False
+        fake_time.sleep = Mock(side_effect=fake_sleep)
+        
+        # Mock frame processing
+        def mock_process_frame(frame):
+            processed_frames.append(clock[0])
+            if len(processed_frames) == num_frames:
+                self.face_processor.running = False
+            return FaceStub(bbox=[0.4, 0.4, 0.2, 0.2], landmarks=[(0.5, 0.5)], confidence=0.9)
             
-            # Calculate expected software crop ratio
-            h, w = frame.shape[:2]
-            face_w = face_data.bbox[2] * w
-            sw_target_size = int(face_w * self.display_processor.zoom_ratios[zoom_level])
-            sw_crop_ratio = sw_target_size / w
+        # Mock get_latest_frame to return frames at 30 FPS
+        def mock_get_latest_frame():
+            return self.test_frame
             
-            print(f"Hardware crop ratio: {hw_crop_ratio:.3f}")
-            print(f"Software crop ratio: {sw_crop_ratio:.3f}")
+        self.camera.get_latest_frame = Mock(side_effect=mock_get_latest_frame)
+        
+        with patch('core.face_processor.time', fake_time), \
+             patch.object(self.face_processor, 'process_frame', side_effect=mock_process_frame):
+            # Run the worker loop directly instead of start()/sleep/stop()
+            self.face_processor.running = True
+            self.face_processor._processing_loop()
             
-            # Hardware crop should always be larger than software crop
-            self.assertGreater(hw_crop_ratio, sw_crop_ratio,
-                             f"Hardware crop for {zoom_level} should be larger than software crop")
-
+        self.assertEqual(len(processed_frames), num_frames)
+        
+        # Calculate actual FPS (mean interval is just first-to-last over the gaps)
+        avg_fps = (len(processed_frames) - 1) / (processed_frames[-1] - processed_frames[0])
+        
+        print(f"Face processing rate: {avg_fps:.1f} FPS")
+        self.assertAlmostEqual(avg_fps, 5.0, delta=0.5)  # Should be close to 5 FPS
+        
     def test_end_to_end_pipeline(self):
         """Test complete pipeline from camera to display"""
         # Mock face data for the pipeline
-        face_data = Mock(
+        face_data = FaceStub(
             bbox=[0.4, 0.4, 0.2, 0.2],
             landmarks=[(0.45, 0.45), (0.55, 0.45), (0.5, 0.5), (0.5, 0.55)],
             confidence=0.9
@@ -234,54 +323,35 @@ class TestMirrorIntegration(unittest.TestCase):
         self.face_processor.get_current_face_data = Mock(return_value=face_data)
         self.face_processor.process_frame = Mock(return_value=face_data)
         
+        # Mocked capture requests hand back the test frame
+        self.mock_picam2.capture_request.return_value.make_array.return_value = self.test_frame
+        
+        # Run the pipeline synchronously, one iteration of each component
+        # per step, instead of starting the threads and sleeping
+        self.camera.running = True  # The frame callback drops frames otherwise
+        for _ in range(5):
+            self.camera._tick()
+            self.face_processor._tick()
+            self.scaler_crop_controller._tick()
+            self.display_processor._tick()
+        self.camera.running = False
+        self.assertIs(self.camera.get_latest_frame(), self.test_frame)
+        
         # Mock frame times
         self.camera.frame_times = [0.0, 0.033, 0.066, 0.099, 0.132]  # 30 FPS
         self.camera.latency_times = [0.015, 0.016, 0.014, 0.015]  # ~15ms latency
         
-        # Start all components
-        self.camera.start()
-        self.scaler_crop_controller.start()
-        self.face_processor.start()
-        self.display_processor.start()
+        # Capture performance metrics
+        camera_fps = len(self.camera.frame_times) / (self.camera.frame_times[-1] - self.camera.frame_times[0])
+        avg_latency = np.mean(self.camera.latency_times) * 1000  # ms
         
-        try:
-            # Let the system run for a short time
-            time.sleep(1.0)
-            
-            # Capture performance metrics
-            camera_fps = len(self.camera.frame_times) / (self.camera.frame_times[-1] - self.camera.frame_times[0])
-            avg_latency = np.mean(self.camera.latency_times) * 1000  # ms
-            
-            print(f"Pipeline performance:")
-            print(f"Camera FPS: {camera_fps:.1f}")
-            print(f"Average latency: {avg_latency:.1f}ms")
-            
-            # Verify performance meets requirements
-            self.assertGreaterEqual(camera_fps, 25.0)  # Should maintain at least 25 FPS
-            self.assertLess(avg_latency, 33.3)  # Should have less than 2-frame latency
-            
-        finally:
-            # Clean up
-            self.display_processor.stop()
-            self.face_processor.stop()
-            self.scaler_crop_controller.stop()
-            self.camera.stop()
+        print(f"Pipeline performance:")
+        print(f"Camera FPS: {camera_fps:.1f}")
+        print(f"Average latency: {avg_latency:.1f}ms")
         
-    def test_buffer_management(self):
-        """Test frame buffer handling under load"""
-        # Fill buffer with frames
-        for _ in range(10):
-            self.camera.frame_buffer.add_frame(self.test_frame)
-            
-        # Verify buffer size remains within limits
-        self.assertLessEqual(
-            self.camera.frame_buffer.get_size(),
-            self.camera.frame_buffer.buffer_size
-        )
-        
-        # Verify we can always get the latest frame
-        latest_frame = self.camera.get_latest_frame()
-        self.assertIsNotNone(latest_frame)
+        # Verify performance meets requirements
+        self.assertGreaterEqual(camera_fps, 25.0)  # Should maintain at least 25 FPS
+        self.assertLess(avg_latency, 33.3)  # Should have less than 2-frame latency
         
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,11 +1,12 @@
 import unittest
 from unittest.mock import Mock, patch
 import time
+import numpy as np
 from core.scaler_crop_controller import ScalerCropController
 from core.camera_manager import ZoomLevel
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MockFaceData:
     bbox: list  # [xmin, ymin, width, height]
     landmarks: list
@@ -51,14 +52,16 @@ class TestScalerCropController(unittest.TestCase):
         
         # Expected size should be face size * hardware_zoom_ratio
         expected_size = 0.25 * 1.2  # 0.25 is face width/height, 1.2 is zoom ratio
-        self.assertAlmostEqual(w, expected_size)
-        self.assertAlmostEqual(h, expected_size)
         
         # Center should be at face center
         face_center_x = 0.375 + 0.25/2  # face_x + face_width/2
         face_center_y = 0.375 + 0.25/2
-        self.assertAlmostEqual(x + w/2, face_center_x)
-        self.assertAlmostEqual(y + h/2, face_center_y)
+        
+        np.testing.assert_allclose(
+            [x + w/2, y + h/2, w, h],
+            [face_center_x, face_center_y, expected_size, expected_size],
+            rtol=0, atol=1e-7
+        )
         
     def test_smooth_crop_update(self):
         """Test smooth transition between crop positions"""
@@ -130,14 +133,19 @@ class TestScalerCropController(unittest.TestCase):
         # Queue to collect any exceptions from threads
         exceptions = queue.Queue()
         
+        # Build the face data once so the threads only exercise the update
+        cases = [
+            MockFaceData(
+                bbox=[0.375 + i/1000, 0.375, 0.25, 0.25],
+                landmarks=[],
+                confidence=0.9
+            )
+            for i in range(100)
+        ]
+        
         def update_crop():
             try:
-                for i in range(100):
-                    face_data = MockFaceData(
-                        bbox=[0.375 + i/1000, 0.375, 0.25, 0.25],
-                        landmarks=[],
-                        confidence=0.9
-                    )
+                for face_data in cases:
                     self.controller.update_target_crop(face_data)
             except Exception as e:
                 exceptions.put(e)